@@ -0,0 +1,35 @@
+"""
+Optional: builds the Cython drag solver (stopping_core) in place, next to
+stopping.py. This is a build script, not packaging metadata.
+
+    pip install cython setuptools
+    python build_ext.py
+
+stopping_core.drag_loop only replaces the step-by-step solver used by
+stopping_distance_numeric_drag(..., analytic=False), and only when numba
+isn't installed. The calculator itself uses the exact solution, so it
+doesn't get faster.
+"""
+import sys
+
+from setuptools import setup, Extension
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    sys.exit("Cython is required to build stopping_core (pip install cython).")
+
+extensions = [
+    Extension(
+        "stopping_core",
+        ["stopping_core.pyx"],
+        extra_compile_args=["-O3", "-ffast-math", "-march=native"],
+    )
+]
+
+if __name__ == "__main__":
+    setup(
+        name="stopping_core",
+        ext_modules=cythonize(extensions),
+        script_args=["build_ext", "--inplace"],
+    )
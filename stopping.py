@@ -1,5 +1,6 @@
 import math
-import matplotlib.pyplot as plt
+from functools import lru_cache
+import numpy as np
 
 AIR_DENSITY = 1.225  # kg/m^3 (approx. at sea level)
 G = 9.81             # gravitational acceleration (m/s^2)
@@ -44,6 +45,9 @@ SLOPE_MENU = {
     "6": ("Steep downhill", -8.0)
 }
 
+# Slope angle alpha (rad) per slope%, prefilled for the menu entries
+ATAN_SLOPE_CACHE = {val: math.atan(abs(val) / 100.0) for (_, val) in SLOPE_MENU.values()}
+
 def convert_kmh_to_ms(speed_kmh: float) -> float:
     """Convert km/h to m/s."""
     return speed_kmh * 1000.0 / 3600.0
@@ -52,6 +56,14 @@ def convert_ms_to_kmh(speed_ms: float) -> float:
     """Convert m/s back to km/h."""
     return speed_ms * 3.6
 
+def slope_angle(slope_percent: float) -> float:
+    """Slope % => angle alpha in radians (cached per slope value)."""
+    alpha = ATAN_SLOPE_CACHE.get(slope_percent)
+    if alpha is None:
+        alpha = math.atan(abs(slope_percent) / 100.0)
+        ATAN_SLOPE_CACHE[slope_percent] = alpha
+    return alpha
+
 def calc_final_friction(weather_mu, tyre_factor, abs_active):
     """
     Combine weather friction + tyre factor + optional ABS bump.
@@ -62,6 +74,19 @@ def calc_final_friction(weather_mu, tyre_factor, abs_active):
         mu += 0.05
     return max(mu, 0.01)  # avoid zero or negative friction
 
+def _braking_terms(mu, mass_kg, cd, frontal_area, slope_percent):
+    """
+    Loop-invariant terms of the braking equation
+       a = - friction_term + slope_acc - k_drag*v^2
+    Returns (friction_term, slope_acc, k_drag). mu may be a NumPy array.
+    """
+    alpha = slope_angle(slope_percent)
+    is_uphill = (slope_percent >= 0)
+    friction_term = mu * G * math.cos(alpha)
+    slope_acc = (-G * math.sin(alpha)) if is_uphill else (G * math.sin(alpha))
+    k_drag = 0.5 * AIR_DENSITY * cd * frontal_area / mass_kg
+    return friction_term, slope_acc, k_drag
+
 def stopping_distance_simple_friction(speed_kmh, mu, slope_percent, reaction_time):
     """
     Simpler friction-based formula ignoring drag:
@@ -70,7 +95,7 @@ def stopping_distance_simple_friction(speed_kmh, mu, slope_percent, reaction_tim
     Returns (total_dist, braking_dist, reaction_dist).
     """
     speed_ms = convert_kmh_to_ms(speed_kmh)
-    alpha = math.atan(abs(slope_percent) / 100.0)
+    alpha = slope_angle(slope_percent)
     is_uphill = (slope_percent >= 0)
 
     # Reaction distance
@@ -85,16 +110,122 @@ def stopping_distance_simple_friction(speed_kmh, mu, slope_percent, reaction_tim
         return float('inf'), float('inf'), reaction_dist  # can't stop under these conditions
 
     # Braking distance via v^2 = 2*a_eff*d => d = v^2 / (2*a_eff)
-    braking_dist = (speed_ms ** 2) / (2 * a_eff)
+    braking_dist = (speed_ms * speed_ms) / (2 * a_eff)
     total_dist = reaction_dist + braking_dist
     return total_dist, braking_dist, reaction_dist
 
+def _rk4_step(x, v, h, friction_term, slope_acc, k_drag):
+    """
+    One classical RK4 step of size h for
+       dx/dt = v,  dv/dt = - friction_term + slope_acc - k_drag*v^2
+    Returns (x_new, v_new).
+    """
+    base_acc = - friction_term + slope_acc
+    k1 = base_acc - k_drag * v * v
+    v2 = v + 0.5 * h * k1
+    k2 = base_acc - k_drag * v2 * v2
+    v3 = v + 0.5 * h * k2
+    k3 = base_acc - k_drag * v3 * v3
+    v4 = v + h * k3
+    k4 = base_acc - k_drag * v4 * v4
+    x_new = x + h * (v + 2.0 * v2 + 2.0 * v3 + v4) / 6.0
+    v_new = v + h * (k1 + 2.0 * k2 + 2.0 * k3 + k4) / 6.0
+    return x_new, v_new
+
+def _make_drag_loop(step):
+    """
+    Builds the integration loop around an RK4 step function, so the plain
+    Python loop and a numba-compiled copy can each use their own step.
+    """
+    def _drag_loop(v0, friction_term, slope_acc, k_drag, dt_max, max_time, eps=1e-3):
+        """
+        Inner integration loop for stopping_distance_numeric_drag, with the
+        slope/friction/drag constants precomputed by the caller:
+           a = - friction_term + slope_acc - k_drag*v^2
+        Integrates with RK4 on an adaptive step. RK4 is exact for constant
+        acceleration, so the step is sized from the jerk (da/dt = -2*k_drag*v*a)
+        to keep each step's error around eps metres: short steps while drag
+        dominates, up to dt_max in the low-speed tail. The step that crosses
+        v=0 is bisected to find the exact stop time.
+        Returns (braking_dist, braking_time, final_v).
+        """
+        v = v0
+        x = 0.0
+        t = 0.0
+        if v <= 0.0:
+            return x, t, 0.0
+
+        while t < max_time:
+            a = - friction_term + slope_acc - k_drag * v * v
+            jerk = abs(2.0 * k_drag * v * a)
+            dt = dt_max
+            if jerk > 0.0:
+                dt = min(dt_max, (eps / jerk) ** (1.0 / 3.0))
+
+            x_new, v_new = step(x, v, dt, friction_term, slope_acc, k_drag)
+            if v_new <= 0.0:
+                # Stops within this step => bisect for the zero crossing
+                lo = 0.0
+                hi = dt
+                for _ in range(40):
+                    h = 0.5 * (lo + hi)
+                    if step(x, v, h, friction_term, slope_acc, k_drag)[1] > 0.0:
+                        lo = h
+                    else:
+                        hi = h
+                x = step(x, v, hi, friction_term, slope_acc, k_drag)[0]
+                t += hi
+                v = 0.0
+                break
+
+            x = x_new
+            v = v_new
+            t += dt
+
+        return x, t, v
+
+    return _drag_loop
+
+_drag_loop = _make_drag_loop(_rk4_step)
+
+_drag_loop_impl = None
+
+def _get_drag_loop():
+    """
+    Fastest available _drag_loop, resolved on first use so that runs which
+    never integrate numerically don't pay for importing numba:
+    numba JIT if installed, else the Cython stopping_core build, else the
+    plain Python loop above.
+    """
+    global _drag_loop_impl
+    if _drag_loop_impl is None:
+        try:
+            from numba import njit
+        except ImportError:
+            try:
+                # Compiled equivalent, see stopping_core.pyx / build_ext.py
+                from stopping_core import drag_loop as impl
+            except ImportError:
+                impl = _drag_loop
+        else:
+            # Private jitted copies; _rk4_step/_drag_loop stay plain Python
+            jit = njit(cache=True, fastmath=True)
+            impl = jit(_make_drag_loop(jit(_rk4_step)))
+        _drag_loop_impl = impl
+    return _drag_loop_impl
+
+@lru_cache(maxsize=256)
 def stopping_distance_numeric_drag(
-    speed_kmh, mu, mass_kg, cd, frontal_area, slope_percent, reaction_time, dt=0.01
+    speed_kmh, mu, mass_kg, cd, frontal_area, slope_percent, reaction_time, dt=1.0,
+    analytic=True
 ):
     """
-    Numerical approach with drag + friction + slope fix:
+    Stopping distance with drag + friction + slope fix:
        a = - mu*g*cos(alpha) + slope_term - drag_term
+    i.e. dv/dt = -A - B*v^2. By default this uses the exact solution
+       d_brake = ln(1 + B*v0^2/A) / (2*B),  t_brake = atan(v0*sqrt(B/A)) / sqrt(A*B)
+    With analytic=False it integrates numerically (adaptive-step RK4;
+    dt is the largest step allowed).
     Returns (dist_total, dist_reaction, dist_braking, total_time, final_v).
     """
     speed_ms = convert_kmh_to_ms(speed_kmh)
@@ -102,308 +233,403 @@ def stopping_distance_numeric_drag(
     # Reaction distance => no deceleration
     reaction_dist = speed_ms * reaction_time
 
-    alpha = math.atan(abs(slope_percent) / 100.0)
-    is_uphill = (slope_percent >= 0)
-
-    v = speed_ms
-    x = 0.0
-    t = 0.0
-    max_time = 300.0  # 5 min cap
-
-    while t < max_time:
-        # Drag
-        drag_acc = (0.5 * AIR_DENSITY * cd * frontal_area * (v ** 2)) / mass_kg
-        # Slope
-        slope_acc = (-G * math.sin(alpha)) if is_uphill else (G * math.sin(alpha))
-        # Net acceleration
-        a = - mu * G * math.cos(alpha) + slope_acc - drag_acc
-
-        v_new = v + a * dt
-        if v_new < 0:
-            # zero within dt
-            dist_this_step = 0.5 * (v + 0.0) * dt
-            x += dist_this_step
-            v_new = 0
-            break
-
-        # distance covered in this step
-        dist_this_step = 0.5 * (v + v_new) * dt
-        x += dist_this_step
-
-        v = v_new
-        t += dt
-
-        if v <= 0.01:  # near zero
-            v = 0
-            break
+    friction_term, slope_acc, k_drag = _braking_terms(
+        mu, mass_kg, cd, frontal_area, slope_percent
+    )
+
+    if analytic:
+        A = friction_term - slope_acc
+        B = k_drag
+        if speed_ms <= 0:
+            # Not moving => nothing to brake (same as _drag_loop)
+            braking_dist = t = 0.0
+        elif A <= 0:
+            # can't stop under these conditions
+            return float('inf'), reaction_dist, float('inf'), float('inf'), speed_ms
+        elif B < 1e-12:
+            braking_dist = speed_ms * speed_ms / (2 * A)
+            t = speed_ms / A
+        else:
+            braking_dist = math.log1p(B * speed_ms * speed_ms / A) / (2 * B)
+            t = math.atan(speed_ms * math.sqrt(B / A)) / math.sqrt(A * B)
+        v = 0.0
+    else:
+        max_time = 300.0  # 5 min cap
+        drag_loop = _get_drag_loop()
+        braking_dist, t, v = drag_loop(speed_ms, friction_term, slope_acc, k_drag, dt, max_time)
 
-    braking_dist = x
     total_dist = reaction_dist + braking_dist
     total_time = reaction_time + t
     return total_dist, reaction_dist, braking_dist, total_time, v
 
-def get_distance_speed_profile(speed_kmh, mu, mass_kg, cd, frontal_area,
-                               slope_percent, reaction_time, dt=0.05):
+def get_distance_speed_profiles(speeds_kmh, mus, reaction_times, mass_kg, cd,
+                                frontal_area, slope_percent, dt=0.2):
     """
-    Returns parallel lists of (distance array, speed array in km/h).
-    We track distance cumulatively and convert speed to km/h.
+    Distance/speed profiles for several scenarios at once: evolves every
+    scenario (one per entry of speeds_kmh / mus / reaction_times) as a
+    single state vector, integrated with RK4. Returns (distance, speed in
+    km/h) float32 arrays of shape (n_steps, n_scenarios); column j is
+    scenario j. Scenarios that stop early hold their final point until the
+    last one stops.
+    Results are cached per input; the returned arrays are read-only.
     """
-    speed_ms = convert_kmh_to_ms(speed_kmh)
-
-    distance_vals = []
-    speed_vals_kmh = []
-    alpha = math.atan(abs(slope_percent) / 100.0)
-    is_uphill = (slope_percent >= 0)
+    return _distance_speed_profiles(
+        tuple(speeds_kmh), tuple(mus), tuple(reaction_times),
+        mass_kg, cd, frontal_area, slope_percent, dt
+    )
+
+@lru_cache(maxsize=32)
+def _distance_speed_profiles(speeds_kmh, mus, reaction_times, mass_kg, cd,
+                             frontal_area, slope_percent, dt):
+    """
+    Cached core of get_distance_speed_profiles (hashable tuple inputs).
+    The state is kept in float32 throughout; rounding over a few thousand
+    steps stays far below plot resolution.
+    """
+    v = np.array([convert_kmh_to_ms(s) for s in speeds_kmh], dtype=np.float32)
+    mu = np.asarray(mus, dtype=np.float32)
+    rt = np.asarray(reaction_times, dtype=float)
 
-    # Reaction distance => no deceleration
-    reaction_dist = speed_ms * reaction_time
+    friction_term, slope_acc, k_drag = _braking_terms(
+        mu, mass_kg, cd, frontal_area, slope_percent
+    )
+    base_acc = - friction_term + slope_acc
+    k_drag = np.float32(k_drag)
 
-    # We'll do the integration in steps: first for the reaction phase
-    # (constant speed, no deceleration).
-    x = 0.0
-    v = speed_ms
-    t = 0.0
     max_time = 300.0
-
-    # (1) Reaction phase
-    while t <= reaction_time:
-        distance_vals.append(x)
-        speed_vals_kmh.append(convert_ms_to_kmh(v))  # convert to km/h
-        t += dt
-        x += v * dt  # traveling at constant speed
-
-    # (2) Braking phase
-    while t <= (reaction_time + max_time):
-        # drag
-        drag_acc = 0.5 * AIR_DENSITY * cd * frontal_area * (v ** 2) / mass_kg
-        # slope
-        slope_acc = (-G * math.sin(alpha)) if is_uphill else (G * math.sin(alpha))
-        # net
-        a = - mu * G * math.cos(alpha) + slope_acc - drag_acc
-
-        v_new = v + a * dt
-        if v_new < 0:
-            v_new = 0
-
-        distance_vals.append(x)
-        speed_vals_kmh.append(convert_ms_to_kmh(v_new))
-
-        # distance for this small interval
-        avg_speed = 0.5 * (v + v_new)
-        x += avg_speed * dt
-
-        v = v_new
-        t += dt
-        if v <= 0.01:
+    n_max = int((rt.max(initial=0.0) + max_time) / dt) + 2
+    dist_hist = np.empty((n_max, v.size), dtype=np.float32)
+    speed_hist = np.empty((n_max, v.size), dtype=np.float32)
+
+    x = np.zeros_like(v)
+    active = v > 0.01
+    v[~active] = 0.0
+
+    zero = np.float32(0.0)
+
+    _where = np.where
+    n_steps = n_max
+    for i in range(n_max):
+        dist_hist[i] = x
+        speed_hist[i] = v
+        if not active.any():
+            n_steps = i + 1
             break
 
-    return distance_vals, speed_vals_kmh
+        # Reaction (constant-speed) part of this step; the step in which a
+        # reaction time ends is split into a partial coast + partial brake.
+        coast = _where(active, np.clip(rt - i * dt, 0.0, dt), 0.0).astype(np.float32)
+        x = x + v * coast
+        braking = active & (coast < dt)
+        h = dt - coast
+        # Masks applied once per step; scenarios still reacting get a = 0.
+        # _rk4_step works on arrays: a = acc0 - kd*v^2 (friction_term=-acc0)
+        acc0 = _where(braking, base_acc, zero)
+        kd = _where(braking, k_drag, zero)
+        x_new, v_new = _rk4_step(x, v, h, -acc0, 0.0, kd)
+
+        stopped = braking & (v_new <= 0.0)
+        if stopped.any():
+            # Land exactly on the stop point: linear estimate of the
+            # zero crossing within this step (<= h, since v_new <= 0),
+            # then a shorter RK4 step.
+            h = _where(stopped, h * v / _where(stopped, v - v_new, 1.0), h)
+            x_stop, _ = _rk4_step(x, v, h, -acc0, 0.0, kd)
+            x_new = _where(stopped, x_stop, x_new)
+            v_new = _where(stopped, zero, v_new)
+
+        x = x_new
+        # Crawling below 0.01 m/s counts as stopped
+        active = v_new > 0.01
+        v = _where(active, v_new, zero)
+
+    dist_out = dist_hist[:n_steps]
+    speed_out = convert_ms_to_kmh(speed_hist[:n_steps])
+    # Shared via the cache => don't let callers modify them
+    dist_out.flags.writeable = False
+    speed_out.flags.writeable = False
+    return dist_out, speed_out
+
+def _profile_worker(params):
+    """
+    Pool worker: solves one subplot's scenarios (a dict of
+    get_distance_speed_profiles arguments plus row/col/title/labels).
+    Returns (row, col, title, labels, dist_hist, spd_kmh_hist).
+    """
+    dist_hist, spd_kmh_hist = get_distance_speed_profiles(
+        speeds_kmh=params["speeds_kmh"],
+        mus=params["mus"],
+        reaction_times=params["reaction_times"],
+        mass_kg=params["mass_kg"],
+        cd=params["cd"],
+        frontal_area=params["frontal_area"],
+        slope_percent=params["slope_percent"],
+        dt=params["dt"]
+    )
+    return params["row"], params["col"], params["title"], params["labels"], dist_hist, spd_kmh_hist
+
+def solve_profile_grid(tasks, processes=1):
+    """
+    Runs _profile_worker over every task (one per subplot). By default this
+    is in-process: each task is a ~1 ms batched NumPy solve, far less than
+    starting worker processes, and it keeps the profile cache warm for
+    repeat runs. Pass processes > 1 (or None for one per CPU) to opt in to
+    a multiprocessing Pool for much larger grids.
+    """
+    if processes is None:
+        import os
+        processes = os.cpu_count() or 1
+    processes = min(processes, len(tasks))
+    if processes <= 1:
+        return [_profile_worker(params) for params in tasks]
+
+    # Only imported when a pool is actually requested
+    from multiprocessing import Pool
+    with Pool(processes=processes) as pool:
+        return pool.map(_profile_worker, tasks)
 
 def main():
-    print("=== Stopping Distance Calculator (Fixed Slope Sign) ===")
-
-    # 1) Car selection
-    print("\nSelect your car from the list below or type 'O' for manual mass entry:")
-    car_keys = list(CAR_DATABASE.keys())
-    for i, ck in enumerate(car_keys, start=1):
-        print(f"{i}. {ck}")
-    print("O. Other (manual entry)")
-
-    user_car_choice = input("> ").strip().upper()
-    known_car = False
-    if user_car_choice == "O":
-        # Manual mass
-        while True:
+    while True:
+        print("=== Stopping Distance Calculator (Fixed Slope Sign) ===")
+
+        # 1) Car selection
+        print("\nSelect your car from the list below or type 'O' for manual mass entry:")
+        car_keys = list(CAR_DATABASE.keys())
+        for i, ck in enumerate(car_keys, start=1):
+            print(f"{i}. {ck}")
+        print("O. Other (manual entry)")
+
+        user_car_choice = input("> ").strip().upper()
+        known_car = False
+        if user_car_choice == "O":
+            # Manual mass
+            while True:
+                try:
+                    user_mass = float(input("Enter your car's mass in kg: "))
+                    if user_mass <= 0:
+                        raise ValueError
+                    car_mass = user_mass
+                    c_d = 0.3
+                    f_area = 2.2
+                    break
+                except ValueError:
+                    print("Invalid mass, please try again.")
+            print("\n** NOTE ** Using simpler friction model (no drag). Results less accurate.\n")
+        else:
             try:
-                user_mass = float(input("Enter your car's mass in kg: "))
-                if user_mass <= 0:
+                idx = int(user_car_choice)
+                if idx < 1 or idx > len(car_keys):
                     raise ValueError
-                car_mass = user_mass
-                c_d = 0.3
-                f_area = 2.2
-                break
-            except ValueError:
-                print("Invalid mass, please try again.")
-        print("\n** NOTE ** Using simpler friction model (no drag). Results less accurate.\n")
-    else:
+                chosen_car = car_keys[idx - 1]
+                (car_mass, c_d, f_area) = CAR_DATABASE[chosen_car]
+                known_car = True
+                print(f"Selected car: {chosen_car}")
+                print(f"  - mass={car_mass} kg")
+            except:
+                print("Invalid selection. Defaulting to Toyota Corolla.")
+                chosen_car = "Toyota Corolla"
+                (car_mass, c_d, f_area) = CAR_DATABASE[chosen_car]
+                known_car = True
+
+        # 2) Weather
+        print("\nSelect road/weather condition:")
+        for k, (desc, muval) in WEATHER_CONDITIONS.items():
+            print(f"{k}. {desc}")
+        w_choice = input("> ").strip()
+        if w_choice in WEATHER_CONDITIONS:
+            (weather_desc, base_mu) = WEATHER_CONDITIONS[w_choice]
+        else:
+            (weather_desc, base_mu) = WEATHER_CONDITIONS["1"]
+
+        # 3) Tyre quality
+        print("\nSelect tyre condition:")
+        for tk, (tdesc, tfact) in TYRE_QUALITY.items():
+            print(f"{tk}. {tdesc}")
+        tyre_choice = input("> ").strip()
+        if tyre_choice in TYRE_QUALITY:
+            (tyre_desc, tyre_factor) = TYRE_QUALITY[tyre_choice]
+        else:
+            (tyre_desc, tyre_factor) = TYRE_QUALITY["2"]
+
+        # 4) ABS
+        abs_choice = input("\nDoes your car have ABS? (y/n): ").strip().lower()
+        abs_active = (abs_choice == "y")
+
+        # 5) Reaction time
+        print("\nAre you tired or well-rested?")
+        print("1. Not tired")
+        print("2. Tired")
+        rt_choice = input("> ").strip()
+        reaction_time = 2.0 if rt_choice == "2" else 1.0
+
+        # 6) Slope
+        print("\nSelect road slope:")
+        for sk, (sd, val) in SLOPE_MENU.items():
+            print(f"{sk}. {sd}")
+        slope_in = input("> ").strip()
+        if slope_in in SLOPE_MENU:
+            slope_desc, slope_val = SLOPE_MENU[slope_in]
+        else:
+            slope_desc, slope_val = SLOPE_MENU["1"]  # default flat
+
+        # 7) Speed
         try:
-            idx = int(user_car_choice)
-            if idx < 1 or idx > len(car_keys):
-                raise ValueError
-            chosen_car = car_keys[idx - 1]
-            (car_mass, c_d, f_area) = CAR_DATABASE[chosen_car]
-            known_car = True
-            print(f"Selected car: {chosen_car}")
-            print(f"  - mass={car_mass} kg")
-        except:
-            print("Invalid selection. Defaulting to Toyota Corolla.")
-            chosen_car = "Toyota Corolla"
-            (car_mass, c_d, f_area) = CAR_DATABASE[chosen_car]
-            known_car = True
-
-    # 2) Weather
-    print("\nSelect road/weather condition:")
-    for k, (desc, muval) in WEATHER_CONDITIONS.items():
-        print(f"{k}. {desc}")
-    w_choice = input("> ").strip()
-    if w_choice in WEATHER_CONDITIONS:
-        (weather_desc, base_mu) = WEATHER_CONDITIONS[w_choice]
-    else:
-        (weather_desc, base_mu) = WEATHER_CONDITIONS["1"]
-
-    # 3) Tyre quality
-    print("\nSelect tyre condition:")
-    for tk, (tdesc, tfact) in TYRE_QUALITY.items():
-        print(f"{tk}. {tdesc}")
-    tyre_choice = input("> ").strip()
-    if tyre_choice in TYRE_QUALITY:
-        (tyre_desc, tyre_factor) = TYRE_QUALITY[tyre_choice]
-    else:
-        (tyre_desc, tyre_factor) = TYRE_QUALITY["2"]
-
-    # 4) ABS
-    abs_choice = input("\nDoes your car have ABS? (y/n): ").strip().lower()
-    abs_active = (abs_choice == "y")
-
-    # 5) Reaction time
-    print("\nAre you tired or well-rested?")
-    print("1. Not tired")
-    print("2. Tired")
-    rt_choice = input("> ").strip()
-    reaction_time = 2.0 if rt_choice == "2" else 1.0
-
-    # 6) Slope
-    print("\nSelect road slope:")
-    for sk, (sd, val) in SLOPE_MENU.items():
-        print(f"{sk}. {sd}")
-    slope_in = input("> ").strip()
-    if slope_in in SLOPE_MENU:
-        slope_desc, slope_val = SLOPE_MENU[slope_in]
-    else:
-        slope_desc, slope_val = SLOPE_MENU["1"]  # default flat
-
-    # 7) Speed
-    try:
-        speed_kmh = float(input("\nEnter speed in km/h: "))
-    except ValueError:
-        speed_kmh = 60.0
-
-    # Combine friction
-    mu_final = calc_final_friction(base_mu, tyre_factor, abs_active)
-
-    # Show summary
-    print("\n=== INPUT SUMMARY ===")
-    if known_car:
-        print(f"Car: {chosen_car} (mass={car_mass} kg)")
-    else:
-        print(f"Manual mass: {car_mass} kg (no drag calc).")
-    print(f"Weather: {weather_desc}, base mu={base_mu:.2f}")
-    print(f"Tyres: {tyre_desc}, ABS={abs_active} => final friction={mu_final:.2f}")
-    print(f"Slope: {slope_desc} ({slope_val:+.1f}%)")
-    print(f"Reaction time: {reaction_time:.2f} s")
-    print(f"Speed: {speed_kmh:.2f} km/h")
-
-    # 8) Compute distances
-    if known_car:
-        # Use numeric approach with drag
-        (dist_total, dist_react, dist_brake, t_total, v_end) = stopping_distance_numeric_drag(
-            speed_kmh, mu_final, car_mass, c_d, f_area, slope_val, reaction_time
-        )
-        if dist_total == float('inf'):
-            print("\nCar cannot stop (net deceleration <= 0).")
-            return
-        print("\n=== RESULTS (NUMERIC + DRAG) ===")
-        print(f"Reaction distance: {dist_react:.2f} m")
-        print(f"Braking distance:  {dist_brake:.2f} m")
-        print(f"TOTAL distance:    {dist_total:.2f} m")
-        print(f"Total time:        {t_total:.2f} s")
-        print(f"Final velocity:    {v_end:.2f} m/s (should be ~0 if fully stopped)")
-
-        # ------------------------------------------------------------------
-        # SINGLE FIGURE: 2×2 subplots, each shows distance (x-axis, m)
-        # vs. speed in km/h (y-axis), using dashed lines.
-        #
-        # We replace "baseline" with the actual user-chosen speed label,
-        # e.g. "60 km/h" if offset=0.
-        # ------------------------------------------------------------------
-        speed_offsets = [-20, -10, 0, 10, 20]  # km/h
-        weather_variants = [
-            ("Dry", 0.85),
-            ("Wet", 0.55),
-        ]
-        reaction_variants = [
-            ("Alert (1s)", 1.0),
-            ("Tired (2s)", 2.0),
-        ]
-
-        fig, axes = plt.subplots(nrows=2, ncols=2, figsize=(12, 8), sharex=False, sharey=False)
-
-        for col_idx, (w_label, w_mu) in enumerate(weather_variants):
-            for row_idx, (rt_label, rt_val) in enumerate(reaction_variants):
-                ax = axes[row_idx, col_idx]
-                ax.set_title(f"{w_label} | {rt_label}", fontsize=11)
-
-                for offset in speed_offsets:
-                    scenario_speed = speed_kmh + offset
-                    if scenario_speed < 0:
-                        scenario_speed = 0  # no negative speeds
-
-                    # Adjust friction for scenario
-                    scenario_mu = calc_final_friction(w_mu, tyre_factor, abs_active)
-
-                    # distance vs. speed-in-kmh profile
-                    dist_arr, spd_kmh_arr = get_distance_speed_profile(
-                        speed_kmh=scenario_speed,
-                        mu=scenario_mu,
-                        mass_kg=car_mass,
-                        cd=c_d,
-                        frontal_area=f_area,
-                        slope_percent=slope_val,
-                        reaction_time=rt_val,
-                        dt=0.05
-                    )
-
-                    # If offset=0, show the actual user-chosen speed (e.g. "60 km/h")
-                    if offset == 0:
-                        offset_str = f"{speed_kmh:.0f} km/h"
-                    elif offset > 0:
-                        offset_str = f"+{offset} km/h"
-                    else:
-                        offset_str = f"{offset} km/h"
-
-                    # Plot dashed line: X=distance (m), Y=speed (km/h)
-                    ax.plot(dist_arr, spd_kmh_arr, ls='--', label=offset_str)
-
-                ax.set_xlabel("Distance (m)", fontsize=9)
-                ax.set_ylabel("Speed (km/h)", fontsize=9)
-                ax.grid(True)
-                ax.legend(fontsize=8)
-
-        fig.suptitle("Speed (km/h) vs. Distance (m)\n(±10/20 km/h, Dry/Wet, Alert/Tired)", fontsize=13)
-        plt.tight_layout()
-        plt.show()
-
-    else:
-        # Simpler friction approach (no drag)
-        dist_total, dist_brake, dist_react = stopping_distance_simple_friction(
-            speed_kmh, mu_final, slope_val, reaction_time
-        )
-        if dist_total == float('inf'):
-            print("\nCar cannot stop under these conditions (net deceleration <= 0).")
-            return
-        print("\n=== RESULTS (SIMPLE FRICTION) ===")
-        print(f"Reaction distance: {dist_react:.2f} m")
-        print(f"Braking distance:  {dist_brake:.2f} m")
-        print(f"TOTAL distance:    {dist_total:.2f} m")
-        print("NOTE: No drag included; results approximate.")
-
-    # Ask user to run again or exit
-    go_again = input("\nGo again? (y/n): ").strip().lower()
-    start_over = (go_again == "y")
-    if start_over:
-        main()
-    else:
-        print("\nDone. Thank you for using the Stopping Distance Calculator!")
+            speed_kmh = float(input("\nEnter speed in km/h: "))
+        except ValueError:
+            speed_kmh = 60.0
+
+        # Combine friction
+        mu_final = calc_final_friction(base_mu, tyre_factor, abs_active)
+
+        # Show summary
+        print("\n=== INPUT SUMMARY ===")
+        if known_car:
+            print(f"Car: {chosen_car} (mass={car_mass} kg)")
+        else:
+            print(f"Manual mass: {car_mass} kg (no drag calc).")
+        print(f"Weather: {weather_desc}, base mu={base_mu:.2f}")
+        print(f"Tyres: {tyre_desc}, ABS={abs_active} => final friction={mu_final:.2f}")
+        print(f"Slope: {slope_desc} ({slope_val:+.1f}%)")
+        print(f"Reaction time: {reaction_time:.2f} s")
+        print(f"Speed: {speed_kmh:.2f} km/h")
+
+        # 8) Compute distances
+        if known_car:
+            # Exact (closed-form) solution with drag
+            (dist_total, dist_react, dist_brake, t_total, _) = stopping_distance_numeric_drag(
+                speed_kmh, mu_final, car_mass, c_d, f_area, slope_val, reaction_time
+            )
+            if dist_total == float('inf'):
+                print("\nCar cannot stop (net deceleration <= 0).")
+            else:
+                print("\n=== RESULTS (EXACT SOLUTION + DRAG) ===")
+                print(f"Reaction distance: {dist_react:.2f} m")
+                print(f"Braking distance:  {dist_brake:.2f} m")
+                print(f"TOTAL distance:    {dist_total:.2f} m")
+                print(f"Total time:        {t_total:.2f} s")
+
+                # matplotlib is only needed here, so import it lazily (and
+                # treat it as optional)
+                try:
+                    import matplotlib.pyplot as plt
+                    from matplotlib.collections import LineCollection
+                    from matplotlib.lines import Line2D
+                except ImportError:
+                    plt = None
+                    print("\nmatplotlib not installed => skipping plots (pip install matplotlib).")
+
+                if plt is not None:
+                    # ------------------------------------------------------------------
+                    # SINGLE FIGURE: 2×2 subplots, each shows distance (x-axis, m)
+                    # vs. speed in km/h (y-axis), using dashed lines.
+                    #
+                    # We replace "baseline" with the actual user-chosen speed label,
+                    # e.g. "60 km/h" if offset=0.
+                    # ------------------------------------------------------------------
+                    speed_offsets = [-20, -10, 0, 10, 20]  # km/h
+                    weather_variants = [
+                        ("Dry", 0.85),
+                        ("Wet", 0.55),
+                    ]
+                    reaction_variants = [
+                        ("Alert (1s)", 1.0),
+                        ("Tired (2s)", 2.0),
+                    ]
+
+                    # One task per subplot; each batches its 5 speed offsets.
+                    tasks = []
+                    for col_idx, (w_label, w_mu) in enumerate(weather_variants):
+                        # Adjust friction for scenario
+                        scenario_mu = calc_final_friction(w_mu, tyre_factor, abs_active)
+                        for row_idx, (rt_label, rt_val) in enumerate(reaction_variants):
+                            labels = []
+                            scenario_speeds = []
+                            for offset in speed_offsets:
+                                scenario_speed = speed_kmh + offset
+                                if scenario_speed < 0:
+                                    scenario_speed = 0  # no negative speeds
+
+                                # If offset=0, show the actual user-chosen speed (e.g. "60 km/h")
+                                if offset == 0:
+                                    offset_str = f"{speed_kmh:.0f} km/h"
+                                elif offset > 0:
+                                    offset_str = f"+{offset} km/h"
+                                else:
+                                    offset_str = f"{offset} km/h"
+
+                                labels.append(offset_str)
+                                scenario_speeds.append(scenario_speed)
+
+                            tasks.append({
+                                "row": row_idx,
+                                "col": col_idx,
+                                "title": f"{w_label} | {rt_label}",
+                                "labels": labels,
+                                "speeds_kmh": scenario_speeds,
+                                "mus": [scenario_mu] * len(scenario_speeds),
+                                "reaction_times": [rt_val] * len(scenario_speeds),
+                                "mass_kg": car_mass,
+                                "cd": c_d,
+                                "frontal_area": f_area,
+                                "slope_percent": slope_val,
+                                "dt": 0.2,
+                            })
+
+                    # distance vs. speed-in-kmh profiles, one column per scenario
+                    results = solve_profile_grid(tasks)
+
+                    fig, axes = plt.subplots(nrows=2, ncols=2, figsize=(12, 8), sharex=True, sharey=True)
+
+                    # Same offsets (and so colours/labels) in every subplot
+                    colors = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+                    labels = results[0][3]
+                    line_colors = [colors[j % len(colors)] for j in range(len(labels))]
+
+                    for row_idx, col_idx, title, _, dist_hist, spd_kmh_hist in results:
+                        ax = axes[row_idx, col_idx]
+                        ax.set_title(title, fontsize=11)
+
+                        # One dashed LineCollection per subplot: X=distance (m), Y=speed (km/h)
+                        segments = [np.column_stack((dist_hist[:, j], spd_kmh_hist[:, j]))
+                                    for j in range(len(labels))]
+                        ax.add_collection(LineCollection(segments, colors=line_colors, linestyles="--"))
+                        ax.autoscale()
+
+                        ax.set_xlabel("Distance (m)", fontsize=9)
+                        ax.set_ylabel("Speed (km/h)", fontsize=9)
+                        ax.grid(True)
+                        ax.label_outer()
+
+                    # Single legend for the whole figure
+                    handles = [Line2D([], [], color=c, ls="--") for c in line_colors]
+                    fig.legend(handles, labels, loc="lower center", ncol=len(labels), fontsize=9)
+
+                    fig.suptitle("Speed (km/h) vs. Distance (m)\n(±10/20 km/h, Dry/Wet, Alert/Tired)", fontsize=13)
+                    plt.tight_layout(rect=(0, 0.05, 1, 1))
+                    plt.show()
+                    # Release the figure so repeat runs don't accumulate them
+                    plt.close(fig)
+
+        else:
+            # Simpler friction approach (no drag)
+            dist_total, dist_brake, dist_react = stopping_distance_simple_friction(
+                speed_kmh, mu_final, slope_val, reaction_time
+            )
+            if dist_total == float('inf'):
+                print("\nCar cannot stop under these conditions (net deceleration <= 0).")
+            else:
+                print("\n=== RESULTS (SIMPLE FRICTION) ===")
+                print(f"Reaction distance: {dist_react:.2f} m")
+                print(f"Braking distance:  {dist_brake:.2f} m")
+                print(f"TOTAL distance:    {dist_total:.2f} m")
+                print("NOTE: No drag included; results approximate.")
+
+        # Ask user to run again or exit
+        go_again = input("\nGo again? (y/n): ").strip().lower()
+        start_over = (go_again == "y")
+        if not start_over:
+            print("\nDone. Thank you for using the Stopping Distance Calculator!")
+            break
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,73 @@
+# cython: language_level=3
+"""
+Compiled version of stopping._drag_loop, for when numba isn't installed.
+Build in place with:  python build_ext.py
+"""
+cimport cython
+from libc.math cimport cbrt, fabs
+
+
+@cython.cdivision(True)
+cdef inline (double, double) _rk4_step(double x, double v, double h,
+                                       double friction_term, double slope_acc,
+                                       double k_drag) noexcept nogil:
+    cdef double base_acc = - friction_term + slope_acc
+    cdef double k1 = base_acc - k_drag * v * v
+    cdef double v2 = v + 0.5 * h * k1
+    cdef double k2 = base_acc - k_drag * v2 * v2
+    cdef double v3 = v + 0.5 * h * k2
+    cdef double k3 = base_acc - k_drag * v3 * v3
+    cdef double v4 = v + h * k3
+    cdef double k4 = base_acc - k_drag * v4 * v4
+    return (x + h * (v + 2.0 * v2 + 2.0 * v3 + v4) / 6.0,
+            v + h * (k1 + 2.0 * k2 + 2.0 * k3 + k4) / 6.0)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cpdef tuple drag_loop(double v0, double friction_term, double slope_acc,
+                      double k_drag, double dt_max, double max_time,
+                      double eps=1e-3):
+    """
+    Same adaptive-step RK4 loop as stopping._drag_loop.
+    Returns (braking_dist, braking_time, final_v).
+    """
+    cdef double v = v0
+    cdef double x = 0.0
+    cdef double t = 0.0
+    cdef double a, jerk, dt, x_new, v_new, lo, hi, h
+    cdef int i
+
+    if v <= 0.0:
+        return x, t, 0.0
+
+    with nogil:
+        while t < max_time:
+            a = - friction_term + slope_acc - k_drag * v * v
+            jerk = fabs(2.0 * k_drag * v * a)
+            dt = dt_max
+            if jerk > 0.0:
+                dt = min(dt_max, cbrt(eps / jerk))
+
+            x_new, v_new = _rk4_step(x, v, dt, friction_term, slope_acc, k_drag)
+            if v_new <= 0.0:
+                # Stops within this step => bisect for the zero crossing
+                lo = 0.0
+                hi = dt
+                for i in range(40):
+                    h = 0.5 * (lo + hi)
+                    if _rk4_step(x, v, h, friction_term, slope_acc, k_drag)[1] > 0.0:
+                        lo = h
+                    else:
+                        hi = h
+                x = _rk4_step(x, v, hi, friction_term, slope_acc, k_drag)[0]
+                t += hi
+                v = 0.0
+                break
+
+            x = x_new
+            v = v_new
+            t += dt
+
+    return x, t, v